@@ -0,0 +1,240 @@
+"""Project 2 Exercise 1: Settings and job metrics shared by the renderer and its CLI front end
+
+This module must not import bpy: the front end imports it to validate
+arguments and record failed jobs before Blender starts.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from enum import Enum
+from pathlib import Path
+from typing import Callable, Iterator, Optional
+
+import typer
+from typing_extensions import Annotated
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+TARGET_BONE_NAME = "mixamorig:Hips"  # Common Mixamo bone name
+BAKE_CHUNK_SIZE = 2000  # Frames per chunk when streaming long takes
+ASPECT_RATIOS = {  # Output resolution per platform crop
+    "9:16": (1080, 1920),  # TikTok, Reels, Shorts
+    "1:1": (1080, 1080),
+    "16:9": (1920, 1080),
+}
+DEFAULT_ASPECT = "9:16"
+METRICS_PREFIX = "tiktok_job"  # Prometheus metric name prefix
+
+
+class RenderEngine(str, Enum):
+    """Render engines a multi-format `render` session can use."""
+
+    CYCLES = "CYCLES"
+    EEVEE = "BLENDER_EEVEE"
+    WORKBENCH = "BLENDER_WORKBENCH"
+
+
+class MetricsFormat(str, Enum):
+    """Formats of the job record written with ``--metrics``."""
+
+    JSONL = "jsonl"
+    PROMETHEUS = "prometheus"
+
+
+# Options taken by every command that records its job with ``track_job``
+MetricsOption = Annotated[
+    Optional[Path],
+    typer.Option("--metrics", help="Append a machine-readable job record to this file"),
+]
+MetricsFormatOption = Annotated[
+    MetricsFormat, typer.Option("--metrics-format", help="Job record format")
+]
+
+
+def hash_file(path: Path) -> Optional[str]:
+    """Get the SHA-256 of a file, or None if it doesn't exist."""
+    if not path.is_file():
+        return None
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_peak_rss_bytes() -> Optional[int]:
+    """Get the peak resident set size of this process."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class JobMetrics:
+    """Collect per-job metrics and write them as a machine-readable record.
+
+    Apply to a command with ``track_job``; the exit status is taken from
+    ``typer.Exit`` or any other exception. With ``output`` set, ``jsonl``
+    appends one JSON line per job and ``prometheus`` atomically replaces a
+    textfile-collector ``.prom`` file with the last job's gauges, labelled
+    with the command and any extra ``labels``. Human output is unaffected. A job marked ``handed_off`` writes nothing because the
+    process it handed off to records the job itself.
+    """
+
+    def __init__(
+        self,
+        command: str,
+        output: Optional[Path] = None,
+        output_format: MetricsFormat = MetricsFormat.JSONL,
+        input_path: Optional[Path] = None,
+    ) -> None:
+        self.command = command
+        self.output = output
+        self.output_format = output_format
+        self.input_path = input_path
+        self.job_id = uuid.uuid4().hex
+        self.stages: dict[str, float] = {}
+        self.frames = 0
+        self.keyframes = 0
+        self.handed_off = False
+        self.labels: dict[str, str] = {}
+        self._start = 0.0
+        self._previous_job: Optional[JobMetrics] = None
+
+    def __enter__(self) -> "JobMetrics":
+        global _current_job
+        self._previous_job, _current_job = _current_job, self
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        global _current_job
+        _current_job = self._previous_job
+        if exc is None:
+            exit_status = 0
+        elif isinstance(exc, typer.Exit):
+            exit_status = exc.exit_code
+        else:
+            exit_status = 1
+        if self.output and not self.handed_off:
+            self.write(self.to_record(exit_status))
+        return False
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a pipeline stage; repeated stages accumulate."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def counts(self) -> dict:
+        """Count session contents for the record; None outside Blender."""
+        return {"objects": None, "datablocks": None}
+
+    def to_record(self, exit_status: int) -> dict:
+        """Build the job record."""
+        duration = time.perf_counter() - self._start  # Before hashing the input
+        return {
+            "job_id": self.job_id,
+            "command": self.command,
+            "labels": self.labels,
+            "input": str(self.input_path) if self.input_path else None,
+            "input_hash": hash_file(self.input_path) if self.input_path else None,
+            "timestamp": time.time(),
+            "duration_s": duration,
+            "stages_s": self.stages,
+            "frames": self.frames,
+            "keyframes": self.keyframes,
+            **self.counts(),
+            "peak_rss_bytes": get_peak_rss_bytes(),
+            "exit_status": exit_status,
+        }
+
+    def write(self, record: dict) -> None:
+        """Write the record to the metrics file in the configured format."""
+        self.output.parent.mkdir(parents=True, exist_ok=True)
+        if self.output_format == MetricsFormat.JSONL:
+            with self.output.open("a") as f:
+                f.write(json.dumps(record) + "\n")
+            return
+
+        labels = ",".join(
+            f'{name}="{value}"'
+            for name, value in {"command": record["command"], **record["labels"]}.items()
+        )
+        gauges = {
+            "duration_seconds": record["duration_s"],
+            "frames": record["frames"],
+            "keyframes": record["keyframes"],
+            "objects": record["objects"],
+            "datablocks": record["datablocks"],
+            "peak_rss_bytes": record["peak_rss_bytes"],
+            "exit_status": record["exit_status"],
+            "last_completion_timestamp_seconds": record["timestamp"],
+        }
+        lines = []
+        for name, value in gauges.items():
+            if value is None:
+                continue
+            lines.append(f"# TYPE {METRICS_PREFIX}_{name} gauge")
+            lines.append(f"{METRICS_PREFIX}_{name}{{{labels}}} {value}")
+        lines.append(f"# TYPE {METRICS_PREFIX}_stage_duration_seconds gauge")
+        for stage, seconds in record["stages_s"].items():
+            lines.append(
+                f'{METRICS_PREFIX}_stage_duration_seconds{{{labels},stage="{stage}"}} {seconds}'
+            )
+
+        # The textfile collector may read at any time, so replace atomically
+        tmp_path = self.output.with_name(f"{self.output.name}.{os.getpid()}.tmp")
+        tmp_path.write_text("\n".join(lines) + "\n")
+        os.replace(tmp_path, self.output)
+
+
+_current_job: Optional[JobMetrics] = None
+
+
+def current_job() -> JobMetrics:
+    """Get the job of the running command."""
+    return _current_job
+
+
+def job_stage(name: str):
+    """Time a stage of the running command's job."""
+    return _current_job.stage(name)
+
+
+def track_job(
+    command: str, input_param: str, metrics_class: type = JobMetrics
+) -> Callable:
+    """Run a command inside a job of ``metrics_class``.
+
+    The command must take ``metrics: MetricsOption`` and
+    ``metrics_format: MetricsFormatOption`` options;
+    ``input_param`` names the parameter whose file is hashed in the record.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with metrics_class(
+                command,
+                kwargs.get("metrics"),
+                kwargs.get("metrics_format", MetricsFormat.JSONL),
+                kwargs.get(input_param),
+            ):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
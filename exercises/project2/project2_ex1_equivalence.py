@@ -0,0 +1,261 @@
+"""Project 2 Exercise 1: Golden-output equivalence harness for bake fast paths
+
+This script uses typer to create a CLI tool that:
+1. Bakes camera tracking with the reference `setup_camera_tracking` path
+2. Bakes the same rig with every registered alternative (fast) path
+3. Compares F-curve keys, handles and evaluated camera matrices within tolerances
+4. Reports each alternative's speed ratio next to its correctness result
+
+Rigs are a generated armature with a procedural walk plus any FBX files given.
+To cover a new fast path, add it to ALTERNATIVES together with the bake it
+must match; both take the same arguments as `bake_reference`. Every bake is
+timed TIMING_RUNS times and the fastest run is reported.
+"""
+
+import math
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import bpy
+import typer
+from typing_extensions import Annotated
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import project2_ex1_fbx_tiktok_renderer as renderer  # noqa: E402
+
+app = typer.Typer(help="Check bake fast paths against the reference output")
+
+KEY_TOLERANCE = 1e-4  # Max abs difference of key values and handles
+MATRIX_TOLERANCE = 1e-4  # Max abs difference of evaluated camera matrix elements
+GENERATED_RIG_FRAMES = 600
+TIMING_RUNS = 3  # Bakes per path; the fastest is used for the speed ratio
+SEAM_SMOOTHING = 5  # Moving-average window of the smoothed seam check
+
+BakeFunction = Callable[[bpy.types.Object, bpy.types.Object, Optional[str], int, int], None]
+
+
+def bake_reference(camera, target, bone_name, frame_start, frame_end) -> None:
+    """The reference per-frame keyframe_insert bake."""
+    renderer.setup_camera_tracking(camera, target, bone_name, frame_start, frame_end)
+
+
+def bake_streamed(camera, target, bone_name, frame_start, frame_end) -> None:
+    """The chunked streaming bake with the default chunk size."""
+    renderer.setup_camera_tracking(
+        camera, target, bone_name, frame_start, frame_end,
+        chunk_size=renderer.BAKE_CHUNK_SIZE,
+    )
+
+
+def bake_streamed_small_chunks(camera, target, bone_name, frame_start, frame_end) -> None:
+    """The chunked streaming bake with many chunk seams."""
+    renderer.setup_camera_tracking(
+        camera, target, bone_name, frame_start, frame_end,
+        chunk_size=renderer.FRAME_STEP * 3,
+    )
+
+
+def bake_smoothed_single_chunk(camera, target, bone_name, frame_start, frame_end) -> None:
+    """The smoothed streaming bake in one chunk, so it has no seams."""
+    renderer.setup_camera_tracking(
+        camera, target, bone_name, frame_start, frame_end,
+        chunk_size=frame_end - frame_start + 1,
+        smoothing=SEAM_SMOOTHING,
+    )
+
+
+def bake_smoothed_small_chunks(camera, target, bone_name, frame_start, frame_end) -> None:
+    """The smoothed streaming bake with many chunk seams."""
+    renderer.setup_camera_tracking(
+        camera, target, bone_name, frame_start, frame_end,
+        chunk_size=renderer.FRAME_STEP * 3,
+        smoothing=SEAM_SMOOTHING,
+    )
+
+
+# Alternative name -> (bake it must match, alternative bake)
+ALTERNATIVES: dict[str, tuple[BakeFunction, BakeFunction]] = {
+    "streamed": (bake_reference, bake_streamed),
+    "streamed-small-chunks": (bake_reference, bake_streamed_small_chunks),
+    # Guards the smoothing // 2 overlap sampled at each chunk seam
+    "smoothed-small-chunks": (bake_smoothed_single_chunk, bake_smoothed_small_chunks),
+}
+
+
+def build_generated_rig(frame_count: int) -> tuple[bpy.types.Object, int, int]:
+    """Build an armature whose hips bone walks a procedural figure-eight."""
+    armature_data = bpy.data.armatures.new("GeneratedRig_data")
+    armature = bpy.data.objects.new("GeneratedRig", armature_data)
+    bpy.context.scene.collection.objects.link(armature)
+    bpy.context.view_layer.objects.active = armature
+
+    bpy.ops.object.mode_set(mode="EDIT")
+    bone = armature_data.edit_bones.new(renderer.TARGET_BONE_NAME)
+    bone.head = (0.0, 0.0, 1.0)
+    bone.tail = (0.0, 0.0, 1.2)
+    bpy.ops.object.mode_set(mode="OBJECT")
+
+    pose_bone = armature.pose.bones[renderer.TARGET_BONE_NAME]
+    for frame in range(1, frame_count + 1):
+        t = frame / 24
+        pose_bone.location = (math.sin(t), 0.1 * math.sin(3 * t), math.sin(2 * t) / 2)
+        pose_bone.keyframe_insert(data_path="location", frame=frame)
+
+    return armature, 1, frame_count
+
+
+def load_fbx_rig(fbx_path: Path) -> tuple[bpy.types.Object, int, int]:
+    """Import an FBX sample rig and return its armature and animation range."""
+    imported_objects = renderer.import_fbx(fbx_path)
+    armature = renderer.find_armature(imported_objects)
+    if armature is None:
+        raise ValueError(f"No armature in {fbx_path}")
+    frame_range = renderer.get_animation_frame_range(armature) or (1, 250)
+    return armature, frame_range[0], frame_range[1]
+
+
+def capture_output(
+    camera: bpy.types.Object, frame_start: int, frame_end: int
+) -> dict[str, list[float]]:
+    """Capture keys, handles and per-frame evaluated matrices of a baked camera."""
+    output = {}
+    for fcurve in camera.animation_data.action.fcurves:
+        channel = f"{fcurve.data_path}[{fcurve.array_index}]"
+        count = len(fcurve.keyframe_points)
+        for attribute in ("co", "handle_left", "handle_right"):
+            values = [0.0] * (2 * count)
+            fcurve.keyframe_points.foreach_get(attribute, values)
+            output[f"{channel}.{attribute}"] = values
+
+    scene = bpy.context.scene
+    matrices = []
+    for frame in range(frame_start, frame_end + 1):
+        scene.frame_set(frame)
+        matrices.extend(value for row in camera.matrix_world for value in row)
+    output["matrix_world"] = matrices
+    return output
+
+
+def max_difference(reference: list[float], candidate: list[float]) -> float:
+    """Max abs difference between two value lists, infinite if lengths differ."""
+    if len(reference) != len(candidate):
+        return math.inf
+    return max((abs(a - b) for a, b in zip(reference, candidate)), default=0.0)
+
+
+def compare_outputs(
+    reference: dict[str, list[float]], candidate: dict[str, list[float]]
+) -> dict[str, float]:
+    """Return the max key, handle and matrix error of a candidate bake."""
+    if reference.keys() != candidate.keys():
+        return {"keys": math.inf, "handles": math.inf, "matrix": math.inf}
+
+    errors = {"keys": 0.0, "handles": 0.0, "matrix": 0.0}
+    for name, values in reference.items():
+        if name == "matrix_world":
+            group = "matrix"
+        elif name.endswith(".co"):
+            group = "keys"
+        else:
+            group = "handles"
+        errors[group] = max(errors[group], max_difference(values, candidate[name]))
+    return errors
+
+
+def run_bake(
+    load_rig: Callable[[], tuple[bpy.types.Object, int, int]],
+    bake: BakeFunction,
+) -> tuple[dict[str, list[float]], float]:
+    """Bake a freshly loaded rig TIMING_RUNS times.
+
+    Returns the captured output of the last run and the fastest bake time.
+    """
+    times = []
+    for _ in range(TIMING_RUNS):
+        renderer.reset_scene()
+        renderer.ensure_object_mode()
+        target, frame_start, frame_end = load_rig()
+        camera = renderer.create_tiktok_camera()
+
+        start = time.perf_counter()
+        bake(camera, target, renderer.TARGET_BONE_NAME, frame_start, frame_end)
+        times.append(time.perf_counter() - start)
+
+    return capture_output(camera, frame_start, frame_end), min(times)
+
+
+def check_rig(
+    rig_name: str, load_rig: Callable[[], tuple[bpy.types.Object, int, int]]
+) -> bool:
+    """Check every alternative bake on one rig and report the results."""
+    typer.secho(f"\n🦴 {rig_name}", fg=typer.colors.CYAN, bold=True)
+
+    references = {}
+    for reference_bake, _ in ALTERNATIVES.values():
+        if reference_bake not in references:
+            references[reference_bake] = run_bake(load_rig, reference_bake)
+            reference_time = references[reference_bake][1]
+            typer.echo(f"  {reference_bake.__name__}: {reference_time * 1000:.1f} ms")
+
+    all_passed = True
+    for name, (reference_bake, bake) in ALTERNATIVES.items():
+        reference, reference_time = references[reference_bake]
+        candidate, candidate_time = run_bake(load_rig, bake)
+        errors = compare_outputs(reference, candidate)
+        passed = (
+            errors["keys"] <= KEY_TOLERANCE
+            and errors["handles"] <= KEY_TOLERANCE
+            and errors["matrix"] <= MATRIX_TOLERANCE
+        )
+        all_passed = all_passed and passed
+        speedup = reference_time / candidate_time if candidate_time else math.inf
+        typer.secho(
+            f"  {'✓' if passed else '✗'} {name}: "
+            f"keys {errors['keys']:.2e}, handles {errors['handles']:.2e}, "
+            f"matrix {errors['matrix']:.2e}, {speedup:.2f}x vs {reference_bake.__name__} "
+            f"({candidate_time * 1000:.1f} ms)",
+            fg=typer.colors.GREEN if passed else typer.colors.RED,
+        )
+    return all_passed
+
+
+@app.command()
+def check(
+    fbx_files: Annotated[
+        Optional[list[Path]], typer.Argument(help="Sample FBX rigs to check")
+    ] = None,
+    frames: Annotated[
+        int, typer.Option("--frames", help="Length of the generated rig's animation")
+    ] = GENERATED_RIG_FRAMES,
+    generated: Annotated[
+        bool, typer.Option("--generated/--no-generated", help="Check the generated rig")
+    ] = True,
+) -> None:
+    """Compare every alternative bake path with the reference path.
+
+    Example:
+        python project2_ex1_equivalence.py check
+        python project2_ex1_equivalence.py check character.fbx --frames 2000
+    """
+    typer.secho("⚖ Bake Equivalence Check", fg=typer.colors.CYAN, bold=True)
+    typer.echo("=" * 50)
+
+    rigs = []
+    if generated:
+        rigs.append((f"generated ({frames} frames)", lambda: build_generated_rig(frames)))
+    for fbx_file in fbx_files or []:
+        rigs.append((fbx_file.name, lambda path=fbx_file: load_fbx_rig(path)))
+
+    results = [check_rig(rig_name, load_rig) for rig_name, load_rig in rigs]
+
+    typer.echo("=" * 50)
+    if not all(results):
+        typer.secho("✗ Some fast paths diverge from the reference", fg=typer.colors.RED, bold=True)
+        raise typer.Exit(code=1)
+    typer.secho("✨ All fast paths match the reference", fg=typer.colors.GREEN, bold=True)
+
+
+if __name__ == "__main__":
+    app(args=sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else None)
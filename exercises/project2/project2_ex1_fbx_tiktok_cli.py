@@ -0,0 +1,678 @@
+"""Project 2 Exercise 1: Fast CLI front end for the FBX TikTok renderer
+
+This script mirrors the commands of project2_ex1_fbx_tiktok_renderer.py but
+never imports bpy itself, so `--help` and argument mistakes are answered in
+milliseconds instead of after Blender starts up. It:
+1. Validates paths, frame ranges and bone names without Blender
+2. Runs the renderer in-process when the bpy module is installed
+3. Otherwise launches `blender --background` once real work is required
+4. Reports import-time costs against a startup budget
+"""
+
+import importlib.util
+import json
+import mmap
+import os
+import re
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+import typer
+from typing_extensions import Annotated
+
+from project2_ex1_common import (
+    ASPECT_RATIOS,
+    BAKE_CHUNK_SIZE,
+    TARGET_BONE_NAME,
+    MetricsFormat,
+    MetricsFormatOption,
+    MetricsOption,
+    RenderEngine,
+    current_job,
+    track_job,
+)
+
+app = typer.Typer(help="Import FBX and create TikTok-style camera automation")
+
+RENDERER_SCRIPT = Path(__file__).with_name("project2_ex1_fbx_tiktok_renderer.py")
+STARTUP_BUDGET_MS = 300  # Max import time of this front end
+ASSET_INDEX = Path("asset_index.sqlite")  # Default report of the validate command
+ASSET_COLUMNS = (
+    "path TEXT PRIMARY KEY",
+    "size INTEGER",
+    "mtime REAL",
+    "armature TEXT",
+    "bone TEXT",
+    "has_bone INTEGER",
+    "frame_start INTEGER",
+    "frame_end INTEGER",
+    "height REAL",
+    "ok INTEGER",
+    "error TEXT",
+)
+IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (.+)")
+
+
+def fail(message: str) -> None:
+    """Report a validation error and exit before Blender is started."""
+    typer.secho(f"Error: {message}", fg=typer.colors.RED)
+    raise typer.Exit(code=2)
+
+
+def validate_input_file(path: Path, suffix: str) -> None:
+    """Check that an input file exists and has the expected extension."""
+    if not path.is_file():
+        fail(f"File not found: {path}")
+    if path.suffix.lower() != suffix:
+        fail(f"Expected a {suffix} file: {path}")
+
+
+def validate_output_file(path: Optional[Path]) -> None:
+    """Check that an output .blend path is writable."""
+    if path is None:
+        return
+    if path.suffix.lower() != ".blend":
+        fail(f"Output must be a .blend file: {path}")
+    if path.is_dir():
+        fail(f"Output is a directory: {path}")
+    parent = next((p for p in path.resolve().parents if p.exists()), None)
+    if parent is None or not os.access(parent, os.W_OK):
+        fail(f"Output directory is not writable: {path.parent}")
+
+
+def validate_frame_range(start_frame: int, end_frame: Optional[int]) -> None:
+    """Check that the requested frame range is not empty."""
+    if end_frame is not None and end_frame < start_frame:
+        fail(f"End frame {end_frame} is before start frame {start_frame}")
+
+
+def validate_bone_name(fbx_path: Path, bone_name: str) -> None:
+    """Check that the bone name appears in the FBX file.
+
+    Binary and ASCII FBX both store node names as plain strings, so a byte
+    search is enough to catch typos without parsing the file.
+    """
+    if not bone_name.strip():
+        fail("Bone name must not be empty")
+    if fbx_path.stat().st_size == 0:
+        return
+    with fbx_path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        if data.find(bone_name.encode("utf-8")) == -1:
+            fail(f"Bone '{bone_name}' not found in {fbx_path}")
+
+
+def validate_metrics(metrics: Optional[Path], metrics_format: MetricsFormat) -> list[str]:
+    """Check the metrics path and return the options as renderer arguments.
+
+    The format itself is checked by typer through MetricsFormatOption.
+    """
+    if metrics is None:
+        return []
+    if metrics.is_dir():
+        fail(f"Metrics path is a directory: {metrics}")
+    return ["--metrics", str(metrics), "--metrics-format", metrics_format.value]
+
+
+def get_worker_metrics(
+    metrics: Optional[Path], metrics_format: MetricsFormat, worker: int
+) -> Optional[Path]:
+    """Get the metrics file of one `validate` worker.
+
+    Prometheus files are replaced on every write, so each worker gets its
+    own ``<stem>.worker<N><suffix>`` file next to the parent's. JSON lines
+    are appended, so workers share the parent's file.
+    """
+    if metrics is None or metrics_format != MetricsFormat.PROMETHEUS:
+        return metrics
+    return metrics.with_name(f"{metrics.stem}.worker{worker}{metrics.suffix}")
+
+
+def find_blender() -> Optional[str]:
+    """Find a Blender executable from $BLENDER or the PATH."""
+    return os.environ.get("BLENDER") or shutil.which("blender")
+
+
+def renderer_command(args: list[str]) -> list[str]:
+    """Build the command line that runs a renderer command in a new process."""
+    if importlib.util.find_spec("bpy") is not None:
+        return [sys.executable, str(RENDERER_SCRIPT), *args]
+
+    blender = find_blender()
+    if blender is None:
+        fail("bpy is not installed and no Blender executable was found (set $BLENDER)")
+    return [blender, "--background", "--python", str(RENDERER_SCRIPT), "--", *args]
+
+
+def run_renderer(args: list[str]) -> None:
+    """Run a renderer command, reusing the bpy module when it is installed.
+
+    From here on the renderer records the job, so the front end's job is
+    marked as handed off and writes no record of its own.
+    """
+    if importlib.util.find_spec("bpy") is not None:
+        sys.path.insert(0, str(RENDERER_SCRIPT.parent))
+        import project2_ex1_fbx_tiktok_renderer as renderer
+
+        current_job().handed_off = True
+        renderer.app(args=args, prog_name=RENDERER_SCRIPT.name)
+        return
+
+    command = renderer_command(args)
+    current_job().handed_off = True
+    raise typer.Exit(code=subprocess.call(command))
+
+
+@contextmanager
+def open_asset_index(index: Path) -> Iterator[sqlite3.Connection]:
+    """Open (and create if needed) the asset index written by `validate`.
+
+    Changes are committed when the block succeeds, and the connection is
+    always closed.
+    """
+    connection = sqlite3.connect(index)
+    try:
+        connection.row_factory = sqlite3.Row
+        with connection:
+            connection.execute(f"CREATE TABLE IF NOT EXISTS assets ({', '.join(ASSET_COLUMNS)})")
+            yield connection
+    finally:
+        connection.close()
+
+
+def lookup_asset(
+    connection: sqlite3.Connection, fbx_path: Path, bone_name: str
+) -> Optional[sqlite3.Row]:
+    """Get the index entry of an FBX file, or None if missing or out of date.
+
+    An entry is out of date when the file's size or mtime changed, or when it
+    was validated for a different bone.
+    """
+    row = connection.execute(
+        "SELECT * FROM assets WHERE path = ?", (str(fbx_path.resolve()),)
+    ).fetchone()
+    if row is None or row["bone"] != bone_name:
+        return None
+    stat = fbx_path.stat()
+    if row["size"] != stat.st_size or row["mtime"] != stat.st_mtime:
+        return None
+    return row
+
+
+def store_asset(connection: sqlite3.Connection, result: dict) -> None:
+    """Insert or replace one validation result in the index."""
+    names = [column.split()[0] for column in ASSET_COLUMNS]
+    connection.execute(
+        f"INSERT OR REPLACE INTO assets ({', '.join(names)}) "
+        f"VALUES ({', '.join('?' for _ in names)})",
+        [result.get(name) for name in names],
+    )
+
+
+def read_shard_output(output: Path) -> tuple[list[dict], set[str]]:
+    """Read a `validate-shard` output file.
+
+    Returns the results and the paths the worker started. A line cut short
+    by a killed worker is skipped.
+    """
+    results = []
+    started = set()
+    if not output.exists():
+        return results, started
+    for line in output.read_text().splitlines():
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        if "started" in record:
+            started.add(record["started"])
+        else:
+            results.append(record)
+    return results, started
+
+
+def measure_import_time(module: str) -> tuple[int, list[tuple[int, str]]]:
+    """Import a module in a fresh interpreter and return its import costs in µs.
+
+    Returns the total cumulative time and the self time of every module.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=RENDERER_SCRIPT.parent,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    total = 0
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, name = match.groups()
+        modules.append((int(self_us), name.strip()))
+        if not name.startswith(" "):
+            total += int(cumulative_us)
+    return total, modules
+
+
+@app.command()
+@track_job("test-import", "fbx_file")
+def test_import(
+    fbx_file: Annotated[Path, typer.Argument(help="Path to the FBX file to test")],
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
+) -> None:
+    """Test importing an FBX file and report what's found.
+
+    Example:
+        python project2_ex1_fbx_tiktok_cli.py test-import character.fbx
+    """
+    validate_input_file(fbx_file, ".fbx")
+    metrics_args = validate_metrics(metrics, metrics_format)
+    run_renderer(["test-import", str(fbx_file), *metrics_args])
+
+
+@app.command()
+@track_job("test-template", "fbx_file")
+def test_template(
+    blend_file: Annotated[Path, typer.Argument(help="Path to the blend file template")],
+    fbx_file: Annotated[Path, typer.Argument(help="Path to the FBX file to import")],
+    output: Annotated[
+        Optional[Path],
+        typer.Option("--output", "-o", help="Output .blend file path"),
+    ] = None,
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
+) -> None:
+    """Test loading a blend file template and importing an FBX into it.
+
+    Example:
+        python project2_ex1_fbx_tiktok_cli.py test-template scene.blend character.fbx
+    """
+    validate_input_file(blend_file, ".blend")
+    validate_input_file(fbx_file, ".fbx")
+    validate_output_file(output)
+    metrics_args = validate_metrics(metrics, metrics_format)
+
+    args = ["test-template", str(blend_file), str(fbx_file), *metrics_args]
+    if output:
+        args += ["--output", str(output)]
+    run_renderer(args)
+
+
+@app.command()
+@track_job("create", "fbx_file")
+def create(
+    fbx_file: Annotated[Path, typer.Argument(help="Path to the FBX file to import")],
+    output: Annotated[
+        Optional[Path],
+        typer.Option("--output", "-o", help="Output .blend file path"),
+    ] = None,
+    bone: Annotated[
+        Optional[str],
+        typer.Option("--bone", "-b", help=f"Target bone name for camera tracking [default: {TARGET_BONE_NAME}]"),
+    ] = None,
+    start_frame: Annotated[
+        Optional[int], typer.Option("--start", "-s", help="Animation start frame (defaults to first frame of armature animation)")
+    ] = None,
+    end_frame: Annotated[
+        Optional[int], typer.Option("--end", "-e", help="Animation end frame (defaults to last frame of armature animation)")
+    ] = None,
+    no_lights: Annotated[
+        bool, typer.Option("--no-lights", help="Skip adding studio lights")
+    ] = False,
+    stream: Annotated[
+        bool,
+        typer.Option("--stream", help="Bake in fixed-size frame chunks (long takes)"),
+    ] = False,
+    chunk_size: Annotated[
+        int,
+        typer.Option("--chunk-size", min=1, help="Frames per chunk when streaming"),
+    ] = BAKE_CHUNK_SIZE,
+    smoothing: Annotated[
+        int,
+        typer.Option("--smoothing", min=1, help="Odd moving-average window in keys when streaming"),
+    ] = 1,
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
+    index: Annotated[
+        Optional[Path],
+        typer.Option("--index", help="Asset index from `validate`: skip bad assets, default the frame range"),
+    ] = None,
+) -> None:
+    """Import an FBX file and create a TikTok-style camera that follows the animation.
+
+    Example:
+        python project2_ex1_fbx_tiktok_cli.py create character.fbx --output my_scene.blend
+        python project2_ex1_fbx_tiktok_cli.py create character.fbx --index asset_index.sqlite
+    """
+    validate_input_file(fbx_file, ".fbx")
+    validate_output_file(output)
+    if index:
+        validate_input_file(index, ".sqlite")
+        with open_asset_index(index) as connection:
+            asset = lookup_asset(connection, fbx_file, bone or TARGET_BONE_NAME)
+        if asset is None:
+            typer.secho(f"⚠ {fbx_file} is not in the index or has changed", fg=typer.colors.YELLOW)
+        elif not asset["ok"]:
+            fail(f"Asset marked bad in {index}: {asset['error']}")
+        else:
+            if start_frame is None:
+                start_frame = asset["frame_start"]
+            if end_frame is None:
+                end_frame = asset["frame_end"]
+    if start_frame is not None:
+        validate_frame_range(start_frame, end_frame)
+    if bone is not None:
+        # Only an explicit --bone is checked: without it the renderer falls
+        # back to the armature origin or the first imported object
+        validate_bone_name(fbx_file, bone)
+    if smoothing > 1 and not stream:
+        fail("--smoothing requires --stream")
+    if smoothing % 2 == 0:
+        fail("--smoothing must be an odd number of keys")
+    metrics_args = validate_metrics(metrics, metrics_format)
+
+    args = ["create", str(fbx_file), *metrics_args]
+    if bone is not None:
+        args += ["--bone", bone]
+    if output:
+        args += ["--output", str(output)]
+    if start_frame is not None:
+        args += ["--start", str(start_frame)]
+    if end_frame is not None:
+        args += ["--end", str(end_frame)]
+    if no_lights:
+        args.append("--no-lights")
+    if stream:
+        args += ["--stream", "--chunk-size", str(chunk_size), "--smoothing", str(smoothing)]
+    run_renderer(args)
+
+
+@app.command()
+@track_job("render", "blend_file")
+def render(
+    blend_file: Annotated[Path, typer.Argument(help="Blend file with a tracked camera (from create)")],
+    output_dir: Annotated[
+        Path, typer.Option("--output-dir", "-o", help="Directory for the image sequences")
+    ] = Path("renders"),
+    aspects: Annotated[
+        Optional[list[str]],
+        typer.Option("--aspect", "-a", help=f"Aspect ratio to render, repeatable ({', '.join(ASPECT_RATIOS)})"),
+    ] = None,
+    camera_name: Annotated[
+        str, typer.Option("--camera", "-c", help="Tracked camera object name")
+    ] = "TikTokCamera",
+    start_frame: Annotated[
+        Optional[int], typer.Option("--start", "-s", help="First frame (defaults to scene start)")
+    ] = None,
+    end_frame: Annotated[
+        Optional[int], typer.Option("--end", "-e", help="Last frame (defaults to scene end)")
+    ] = None,
+    engine: Annotated[
+        RenderEngine,
+        typer.Option("--engine", help="Render engine for the session (persistent data needs CYCLES)"),
+    ] = RenderEngine.CYCLES.value,
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
+) -> None:
+    """Render several aspect ratios of the tracked camera in a single session.
+
+    Example:
+        python project2_ex1_fbx_tiktok_cli.py render scene.blend -a 9:16 -a 1:1 -a 16:9
+    """
+    validate_input_file(blend_file, ".blend")
+    if output_dir.exists() and not output_dir.is_dir():
+        fail(f"Output is not a directory: {output_dir}")
+    unknown = [aspect for aspect in aspects or [] if aspect not in ASPECT_RATIOS]
+    if unknown:
+        fail(f"Unknown aspect ratio(s): {', '.join(unknown)}")
+    if start_frame is not None:
+        validate_frame_range(start_frame, end_frame)
+    metrics_args = validate_metrics(metrics, metrics_format)
+
+    args = ["render", str(blend_file), "--output-dir", str(output_dir), "--camera", camera_name]
+    args += ["--engine", engine.value, *metrics_args]
+    for aspect in aspects or []:
+        args += ["--aspect", aspect]
+    if start_frame is not None:
+        args += ["--start", str(start_frame)]
+    if end_frame is not None:
+        args += ["--end", str(end_frame)]
+    run_renderer(args)
+
+
+@app.command()
+@track_job("bench-reset", "fbx_file")
+def bench_reset(
+    fbx_file: Annotated[Path, typer.Argument(help="FBX file imported by every simulated job")],
+    template: Annotated[
+        Optional[Path],
+        typer.Option("--template", "-t", help="Blend template used as the base scene"),
+    ] = None,
+    iterations: Annotated[
+        int, typer.Option("--iterations", "-n", min=1, help="Jobs to simulate per reset path")
+    ] = 5,
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
+) -> None:
+    """Compare the full scene reset with snapshot restore between jobs.
+
+    Example:
+        python project2_ex1_fbx_tiktok_cli.py bench-reset character.fbx -n 10
+    """
+    validate_input_file(fbx_file, ".fbx")
+    if template:
+        validate_input_file(template, ".blend")
+    metrics_args = validate_metrics(metrics, metrics_format)
+
+    args = ["bench-reset", str(fbx_file), "--iterations", str(iterations), *metrics_args]
+    if template:
+        args += ["--template", str(template)]
+    run_renderer(args)
+
+
+@app.command()
+@track_job("validate", "directory")
+def validate(
+    directory: Annotated[Path, typer.Argument(help="Directory searched recursively for FBX files")],
+    index: Annotated[
+        Path, typer.Option("--index", "-i", help="SQLite report to create or update")
+    ] = ASSET_INDEX,
+    workers: Annotated[
+        int, typer.Option("--workers", "-w", min=1, help="Number of headless Blender processes")
+    ] = os.cpu_count() or 1,
+    bone: Annotated[
+        str,
+        typer.Option("--bone", "-b", help="Target bone name required by camera tracking"),
+    ] = TARGET_BONE_NAME,
+    force: Annotated[
+        bool, typer.Option("--force", help="Revalidate files that are already indexed")
+    ] = False,
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
+) -> None:
+    """Validate an FBX library in parallel and record the results in an index.
+
+    Files are sharded across worker processes that each validate their shard
+    in one Blender session. Unchanged files that are already indexed for the
+    same bone are skipped unless --force is given. Exits with code 1 when a
+    worker fails or a file could not be validated.
+
+    Example:
+        python project2_ex1_fbx_tiktok_cli.py validate assets/ --workers 8 --index asset_index.sqlite
+    """
+    if not directory.is_dir():
+        fail(f"Directory not found: {directory}")
+    if index.suffix.lower() != ".sqlite":
+        fail(f"Index must be a .sqlite file: {index}")
+    validate_metrics(metrics, metrics_format)
+
+    typer.secho("🔍 Validating Asset Library", fg=typer.colors.CYAN, bold=True)
+    typer.echo("=" * 50)
+
+    fbx_files = sorted(p for p in directory.rglob("*") if p.suffix.lower() == ".fbx")
+    with open_asset_index(index) as connection:
+        pending = [
+            p for p in fbx_files if force or lookup_asset(connection, p, bone) is None
+        ]
+    typer.echo(f"Found {len(fbx_files)} FBX files, {len(pending)} to validate")
+
+    shards = [shard for shard in (pending[i::workers] for i in range(workers)) if shard]
+    results = []
+    failed_workers = 0
+    unvalidated = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        processes = []
+        for shard_index, shard in enumerate(shards):
+            list_file = Path(tmp) / f"shard_{shard_index}.txt"
+            list_file.write_text("\n".join(str(p.resolve()) for p in shard))
+            output = Path(tmp) / f"shard_{shard_index}.jsonl"
+            log = (Path(tmp) / f"shard_{shard_index}.log").open("w")
+            worker_metrics = get_worker_metrics(metrics, metrics_format, shard_index)
+            command = renderer_command(
+                [
+                    "validate-shard", str(list_file), "--output", str(output), "--bone", bone,
+                    "--worker", str(shard_index), *validate_metrics(worker_metrics, metrics_format),
+                ]
+            )
+            process = subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)
+            processes.append((process, log, output, shard))
+        typer.echo(f"Started {len(processes)} workers")
+
+        for shard_index, (process, log, output, shard) in enumerate(processes):
+            exit_code = process.wait()
+            log.close()
+            shard_results, started = read_shard_output(output)
+
+            # Only a file the worker started and never finished is blamed for
+            # the crash; the rest are stored without size so the next run
+            # retries them (e.g. when Blender failed to start at all)
+            done = {result["path"] for result in shard_results}
+            for fbx_path in shard:
+                path = str(fbx_path.resolve())
+                if path in done:
+                    continue
+                unvalidated += 1
+                crashed_here = path in started
+                stat = fbx_path.stat()
+                shard_results.append(
+                    {
+                        "path": path,
+                        "size": stat.st_size if crashed_here else None,
+                        "mtime": stat.st_mtime,
+                        "bone": bone,
+                        "ok": False,
+                        "error": (
+                            f"Worker exited with code {exit_code} while validating"
+                            if crashed_here
+                            else f"Not validated (worker exited with code {exit_code})"
+                        ),
+                    }
+                )
+            results.extend(shard_results)
+            if exit_code != 0:
+                failed_workers += 1
+
+            color = typer.colors.GREEN if exit_code == 0 else typer.colors.RED
+            typer.secho(
+                f"  Worker {shard_index + 1}/{len(processes)}: "
+                f"{len(shard)} files, exit code {exit_code}",
+                fg=color,
+            )
+
+    with open_asset_index(index) as connection:
+        for result in results:
+            store_asset(connection, result)
+
+    bad = [result for result in results if not result["ok"]]
+    typer.echo("=" * 50)
+    for result in bad[:10]:  # Show first 10
+        typer.secho(f"  ✗ {Path(result['path']).name}: {result['error']}", fg=typer.colors.YELLOW)
+    if len(bad) > 10:
+        typer.echo(f"  ... and {len(bad) - 10} more")
+    if failed_workers or unvalidated:
+        # A preflight gate must not pass when files went unchecked
+        typer.secho(
+            f"✗ {failed_workers} worker(s) failed, {unvalidated} file(s) not validated, index: {index}",
+            fg=typer.colors.RED,
+            bold=True,
+        )
+        raise typer.Exit(code=1)
+    typer.secho(
+        f"✨ {len(results) - len(bad)} ok, {len(bad)} bad, index: {index}",
+        fg=typer.colors.GREEN,
+        bold=True,
+    )
+
+
+@app.command()
+def list_assets(
+    index: Annotated[Path, typer.Argument(help="SQLite report written by validate")] = ASSET_INDEX,
+    bad: Annotated[bool, typer.Option("--bad", help="Only list assets that failed validation")] = False,
+) -> None:
+    """List the assets in a validation index.
+
+    Example:
+        python project2_ex1_fbx_tiktok_cli.py list-assets asset_index.sqlite --bad
+    """
+    validate_input_file(index, ".sqlite")
+    query = "SELECT * FROM assets" + (" WHERE NOT ok" if bad else "") + " ORDER BY path"
+    with open_asset_index(index) as connection:
+        for row in connection.execute(query):
+            if row["ok"]:
+                typer.secho(
+                    f"✓ {row['path']} (frames {row['frame_start']} - {row['frame_end']})",
+                    fg=typer.colors.GREEN,
+                )
+            else:
+                typer.secho(f"✗ {row['path']}: {row['error']}", fg=typer.colors.YELLOW)
+
+
+@app.command()
+def startup_report(
+    budget_ms: Annotated[
+        int, typer.Option("--budget", help="Startup budget in milliseconds")
+    ] = STARTUP_BUDGET_MS,
+    top: Annotated[
+        int, typer.Option("--top", help="Number of slowest modules to list")
+    ] = 10,
+) -> None:
+    """Report import-time costs of this front end and check the startup budget.
+
+    Example:
+        python project2_ex1_fbx_tiktok_cli.py startup-report --budget 300
+    """
+    typer.secho("⏱ Startup Report", fg=typer.colors.CYAN, bold=True)
+    typer.echo("=" * 50)
+
+    total_us, modules = measure_import_time(Path(__file__).stem)
+    typer.echo(f"Front end import time: {total_us / 1000:.1f} ms")
+    typer.echo("Slowest modules (self time):")
+    for self_us, name in sorted(modules, reverse=True)[:top]:
+        typer.echo(f"  {self_us / 1000:7.1f} ms  {name.strip()}")
+
+    if any(name.strip() == "bpy" for _, name in modules):
+        typer.secho("  ⚠ bpy is imported at startup", fg=typer.colors.YELLOW)
+
+    if importlib.util.find_spec("bpy") is not None:
+        bpy_us, _ = measure_import_time("bpy")
+        typer.echo(f"bpy import time (paid only for real work): {bpy_us / 1000:.1f} ms")
+
+    typer.echo("=" * 50)
+    if total_us / 1000 > budget_ms:
+        typer.secho(f"✗ Over budget ({budget_ms} ms)", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+    typer.secho(f"✓ Within budget ({budget_ms} ms)", fg=typer.colors.GREEN)
+
+
+if __name__ == "__main__":
+    app()
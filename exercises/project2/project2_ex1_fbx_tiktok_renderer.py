@@ -6,21 +6,90 @@ This script uses typer to create a CLI tool that:
 3. Automatically follows the character's animation with smooth tracking
 """
 
+import json
+import math
+import sys
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 import bpy
 import typer
 from mathutils import Vector
 from typing_extensions import Annotated
 
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from project2_ex1_common import (  # noqa: E402
+    ASPECT_RATIOS,
+    BAKE_CHUNK_SIZE,
+    DEFAULT_ASPECT,
+    TARGET_BONE_NAME,
+    JobMetrics,
+    MetricsFormat,
+    MetricsFormatOption,
+    MetricsOption,
+    RenderEngine,
+    current_job,
+    job_stage,
+    track_job,
+)
+
 app = typer.Typer(help="Import FBX and create TikTok-style camera automation")
 
 SAVE_NAME = "week2ex4_tiktok.blend"
 FRAME_STEP = 5  # Bake keyframes every N frames
 CAMERA_DISTANCE = 2.5  # Distance from target in meters
 CAMERA_HEIGHT_OFFSET = 1.5  # Height above target center
-TARGET_BONE_NAME = "mixamorig:Hips"  # Common Mixamo bone name
+DATABLOCK_COLLECTIONS = (  # bpy.data collections counted as datablocks
+    "actions",
+    "armatures",
+    "cameras",
+    "collections",
+    "images",
+    "lights",
+    "materials",
+    "meshes",
+    "node_groups",
+    "objects",
+    "scenes",
+    "textures",
+    "worlds",
+)
+SNAPSHOT_COLLECTIONS = DATABLOCK_COLLECTIONS + (  # bpy.data collections snapshotted
+    "curves",
+    "lattices",
+    "particles",
+    "sounds",
+    "speakers",
+    "volumes",
+)
+RIG_HEIGHT_RANGE = (0.3, 5.0)  # Sane armature height in meters for validation
+SNAPSHOT_SETTINGS = (  # Scene settings reverted by SceneSnapshot.restore
+    "frame_start",
+    "frame_end",
+    "frame_current",
+    "camera",
+    "world",
+    "render.engine",
+    "render.resolution_x",
+    "render.resolution_y",
+    "render.resolution_percentage",
+    "render.filepath",
+    "render.use_persistent_data",
+    "render.image_settings.file_format",
+)
+SNAPSHOT_ID_SETTINGS = {  # Datablock settings, stored by name, and their collection
+    "camera": "objects",
+    "world": "worlds",
+}
+
+
+def set_resolution(aspect: str) -> None:
+    """Set the scene render resolution for an aspect ratio from ASPECT_RATIOS."""
+    render = bpy.context.scene.render
+    render.resolution_x, render.resolution_y = ASPECT_RATIOS[aspect]
+    render.resolution_percentage = 100
 
 
 def reset_scene() -> None:
@@ -29,9 +98,7 @@ def reset_scene() -> None:
     bpy.context.scene.render.engine = "BLENDER_EEVEE"
 
     # TikTok aspect ratio: 9:16 (vertical video)
-    bpy.context.scene.render.resolution_x = 1080
-    bpy.context.scene.render.resolution_y = 1920
-    bpy.context.scene.render.resolution_percentage = 100
+    set_resolution(DEFAULT_ASPECT)
 
 
 def ensure_object_mode() -> None:
@@ -103,20 +170,130 @@ def create_tiktok_camera(name: str = "TikTokCamera") -> bpy.types.Object:
     return camera
 
 
+def get_vertical_sensor_size(camera_data: bpy.types.Camera, aspect: str) -> float:
+    """Get the sensor size (mm) that spans the frame height at an aspect ratio."""
+    width, height = ASPECT_RATIOS[aspect]
+    if camera_data.sensor_fit == "VERTICAL":
+        return camera_data.sensor_height
+    if camera_data.sensor_fit == "HORIZONTAL":
+        return camera_data.sensor_width * height / width
+    # AUTO fits sensor_width to the larger side
+    return camera_data.sensor_width * min(1.0, height / width)
+
+
+def create_aspect_camera(camera: bpy.types.Object, aspect: str) -> bpy.types.Object:
+    """Create a camera for one aspect ratio that shares the tracked camera's motion.
+
+    The object keeps a reference to the same action, so the baked tracking is
+    not duplicated per format. The sensor is fitted vertically to the tracked
+    camera's framing at DEFAULT_ASPECT, so every format keeps the subject's
+    full height and wider formats only add width.
+    """
+    label = aspect.replace(":", "x")
+    name = f"{camera.name}_{label}"
+    if name in bpy.data.objects:
+        return bpy.data.objects[name]
+
+    aspect_camera = camera.copy()
+    aspect_camera.data = camera.data.copy()
+    aspect_camera.name = name
+    aspect_camera.data.name = f"{name}_data"
+    aspect_camera.data.sensor_fit = "VERTICAL"
+    aspect_camera.data.sensor_height = get_vertical_sensor_size(camera.data, DEFAULT_ASPECT)
+    for collection in camera.users_collection:
+        collection.objects.link(aspect_camera)
+    return aspect_camera
+
+
+def get_animation_frame_range(
+    obj: bpy.types.Object,
+) -> Optional[tuple[int, int]]:
+    """Get the frame range that evaluating the object's animation covers.
+
+    This is the active action plus, when the NLA is enabled, the unmuted
+    strips of the unmuted tracks (only the solo tracks if any is soloed).
+    """
+    anim = obj.animation_data
+    if not anim:
+        return None
+
+    ranges = []
+    if anim.action:
+        ranges.append(tuple(anim.action.frame_range))
+    tracks = [track for track in anim.nla_tracks if not track.mute] if anim.use_nla else []
+    solo_tracks = [track for track in tracks if track.is_solo]
+    for track in solo_tracks or tracks:
+        for strip in track.strips:
+            if not strip.mute:
+                ranges.append((strip.frame_start, strip.frame_end))
+
+    if not ranges:
+        return None
+    start = min(r[0] for r in ranges)
+    end = max(r[1] for r in ranges)
+    return int(math.floor(start)), int(math.ceil(end))
+
+
+def get_tracking_target_location(
+    target: bpy.types.Object, bone_name: Optional[str] = None
+) -> tuple[float, float, float]:
+    """Get the world location the camera should follow at the current frame."""
+    if target.type == "ARMATURE" and bone_name:
+        return get_target_world_location(target, bone_name)
+    return tuple(target.matrix_world.translation)
+
+
+def solve_camera_transform(
+    target_loc: tuple[float, float, float],
+) -> tuple[tuple[float, float, float], tuple[float, float, float]]:
+    """Solve camera location and rotation (euler) looking at the target."""
+    # Position camera behind and above target
+    location = (
+        target_loc[0],
+        target_loc[1] - CAMERA_DISTANCE,
+        target_loc[2] + CAMERA_HEIGHT_OFFSET,
+    )
+
+    # Point camera at target
+    direction = Vector(
+        (
+            target_loc[0] - location[0],
+            target_loc[1] - location[1],
+            target_loc[2] - location[2],
+        )
+    )
+    rotation = direction.to_track_quat("-Z", "Y").to_euler()
+    return location, tuple(rotation)
+
+
 def setup_camera_tracking(
     camera: bpy.types.Object,
     target: bpy.types.Object,
     bone_name: Optional[str] = None,
     frame_start: int = 1,
     frame_end: int = 250,
+    chunk_size: Optional[int] = None,
+    smoothing: int = 1,
 ) -> None:
-    """Setup camera to follow the target with baked keyframes."""
+    """Setup camera to follow the target with baked keyframes.
+
+    When ``chunk_size`` is given the bake streams through the range in chunks
+    of that many frames (see ``_bake_camera_tracking_chunked``); ``smoothing``
+    only applies to the streaming bake.
+    """
     typer.echo(f"Setting up camera tracking from frame {frame_start} to {frame_end}")
 
     # Clear existing animation data
     if camera.animation_data:
         camera.animation_data_clear()
 
+    if chunk_size is not None:
+        key_count = _bake_camera_tracking_chunked(
+            camera, target, bone_name, frame_start, frame_end, chunk_size, smoothing
+        )
+        typer.secho(f"✓ Baked {key_count} keyframes", fg=typer.colors.GREEN)
+        return
+
     scene = bpy.context.scene
 
     # Bake keyframes
@@ -124,44 +301,90 @@ def setup_camera_tracking(
         scene.frame_set(frame)
 
         # Get target location
-        if target.type == "ARMATURE" and bone_name:
-            target_loc = get_target_world_location(target, bone_name)
-        else:
-            target_loc = tuple(target.matrix_world.translation)
-
-        # Position camera behind and above target
-        camera.location = (
-            target_loc[0],
-            target_loc[1] - CAMERA_DISTANCE,
-            target_loc[2] + CAMERA_HEIGHT_OFFSET,
-        )
-
-        # Point camera at target
-        direction = Vector(
-            (
-                target_loc[0] - camera.location[0],
-                target_loc[1] - camera.location[1],
-                target_loc[2] - camera.location[2],
-            )
-        )
-
-        # Calculate rotation to look at target
-        import math
+        target_loc = get_tracking_target_location(target, bone_name)
 
-        rot_quat = camera.rotation_euler.to_quaternion()
-        track_quat = direction.to_track_quat("-Z", "Y")
-        camera.rotation_euler = track_quat.to_euler()
+        # Position camera behind and above target, looking at it
+        camera.location, camera.rotation_euler = solve_camera_transform(target_loc)
 
         # Insert keyframes
         camera.keyframe_insert(data_path="location", frame=frame)
         camera.keyframe_insert(data_path="rotation_euler", frame=frame)
 
     typer.secho(
-        f"✓ Baked {(frame_end - frame_start) // FRAME_STEP + 1} keyframes",
+        f"✓ Baked {len(range(frame_start, frame_end + 1, FRAME_STEP))} keyframes",
         fg=typer.colors.GREEN,
     )
 
 
+def _bake_camera_tracking_chunked(
+    camera: bpy.types.Object,
+    target: bpy.types.Object,
+    bone_name: Optional[str],
+    frame_start: int,
+    frame_end: int,
+    chunk_size: int,
+    smoothing: int,
+) -> int:
+    """Evaluate, solve and write camera keys one chunk of frames at a time.
+
+    Only one chunk of target samples is alive at any point, so memory stays
+    flat for long takes. ``smoothing`` is the odd width of a centered moving
+    average in keys. Each chunk also samples ``smoothing // 2`` keys on
+    either side so the moving average matches an unchunked bake at the seams.
+    Keys are written with ``keyframe_points.insert(..., options={"FAST"})``
+    and handles are recalculated once at the end.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    if smoothing < 1 or smoothing % 2 == 0:
+        raise ValueError("smoothing must be an odd number of keys")
+
+    scene = bpy.context.scene
+    frames = range(frame_start, frame_end + 1, FRAME_STEP)
+    keys_per_chunk = max(1, chunk_size // FRAME_STEP)
+    overlap = smoothing // 2
+    chunk_count = math.ceil(len(frames) / keys_per_chunk) if frames else 0
+
+    camera.animation_data_create()
+    action = bpy.data.actions.new(name=f"{camera.name}Action")
+    camera.animation_data.action = action
+    fcurves = [
+        action.fcurves.new(data_path, index=index, action_group="Object Transforms")
+        for data_path in ("location", "rotation_euler")
+        for index in range(3)
+    ]
+
+    for chunk_index, first in enumerate(range(0, len(frames), keys_per_chunk)):
+        last = min(first + keys_per_chunk, len(frames))
+        typer.echo(
+            f"  Chunk {chunk_index + 1}/{chunk_count}: "
+            f"frames {frames[first]} - {frames[last - 1]}"
+        )
+
+        # Sample the chunk plus its overlap with the neighbouring chunks
+        sample_first = max(0, first - overlap)
+        sample_last = min(len(frames), last + overlap)
+        samples = []
+        for frame in frames[sample_first:sample_last]:
+            scene.frame_set(frame)
+            samples.append(get_tracking_target_location(target, bone_name))
+
+        for key_index in range(first, last):
+            window_start = max(sample_first, key_index - overlap) - sample_first
+            window_end = min(sample_last, key_index + overlap + 1) - sample_first
+            window = samples[window_start:window_end]
+            target_loc = tuple(sum(axis) / len(window) for axis in zip(*window))
+            location, rotation = solve_camera_transform(target_loc)
+            frame = frames[key_index]
+            for fcurve, value in zip(fcurves, location + rotation):
+                fcurve.keyframe_points.insert(frame, value, options={"FAST"})
+
+    for fcurve in fcurves:
+        fcurve.update()
+
+    return len(frames)
+
+
 def add_studio_lighting() -> None:
     """Add basic three-point lighting setup."""
     typer.echo("Adding studio lighting")
@@ -189,6 +412,78 @@ def add_studio_lighting() -> None:
     typer.secho("✓ Lighting setup complete", fg=typer.colors.GREEN)
 
 
+def render_aspect_ratios(
+    camera: bpy.types.Object,
+    aspects: list[str],
+    output_dir: Path,
+    frame_start: int,
+    frame_end: int,
+    engine: str = RenderEngine.CYCLES.value,
+) -> None:
+    """Render every aspect ratio per frame in one session.
+
+    Each frame is evaluated once and rendered through one camera per aspect
+    ratio. The session switches to ``engine`` (Cycles by default) with
+    persistent data, which keeps the BVH, textures and shaders resident
+    between renders, so extra formats cost roughly their pixels. Other
+    engines ignore persistent data and sync the scene for every render; the
+    per-format render times printed at the end show what each format costs.
+    Frames land in one image sequence per aspect ratio under ``output_dir``,
+    and the scene's render settings are restored afterwards.
+    """
+    scene = bpy.context.scene
+    render = scene.render
+
+    cameras = {aspect: create_aspect_camera(camera, aspect) for aspect in aspects}
+    for aspect in aspects:
+        (output_dir / aspect.replace(":", "x")).mkdir(parents=True, exist_ok=True)
+
+    if engine != RenderEngine.CYCLES:
+        typer.secho(
+            f"⚠ Persistent data only applies to Cycles; {engine} syncs the scene per render",
+            fg=typer.colors.YELLOW,
+        )
+
+    render_times = {aspect: 0.0 for aspect in aspects}
+    original_camera = scene.camera
+    original_resolution = (render.resolution_x, render.resolution_y)
+    original_filepath = render.filepath
+    original_engine = render.engine
+    original_persistent_data = render.use_persistent_data
+    original_file_format = render.image_settings.file_format
+    try:
+        render.engine = engine
+        render.use_persistent_data = True
+        render.image_settings.file_format = "PNG"
+        for frame in range(frame_start, frame_end + 1):
+            scene.frame_set(frame)
+            for aspect, aspect_camera in cameras.items():
+                scene.camera = aspect_camera
+                set_resolution(aspect)
+                render.filepath = str(
+                    output_dir / aspect.replace(":", "x") / f"frame_{frame:04d}"
+                )
+                start = time.perf_counter()
+                bpy.ops.render.render(write_still=True)
+                render_times[aspect] += time.perf_counter() - start
+            typer.echo(f"  Frame {frame}/{frame_end}: {len(cameras)} formats")
+    finally:
+        scene.camera = original_camera
+        render.resolution_x, render.resolution_y = original_resolution
+        render.filepath = original_filepath
+        render.engine = original_engine
+        render.use_persistent_data = original_persistent_data
+        render.image_settings.file_format = original_file_format
+
+    typer.secho(
+        f"✓ Rendered {frame_end - frame_start + 1} frames x {len(cameras)} formats",
+        fg=typer.colors.GREEN,
+    )
+    frame_count = max(1, frame_end - frame_start + 1)
+    for aspect, seconds in render_times.items():
+        typer.echo(f"  {aspect}: {1000 * seconds / frame_count:.1f} ms/frame")
+
+
 def save_blend_file(output_path: Optional[Path] = None) -> None:
     """Save the blend file."""
     if output_path is None:
@@ -219,9 +514,201 @@ def remove_imported_objects(imported_objects: list[bpy.types.Object]) -> None:
             bpy.data.objects.remove(obj, do_unlink=True)
 
 
+def _get_setting(scene: bpy.types.Scene, path: str):
+    """Get a dotted scene setting such as ``render.resolution_x``.
+
+    Datablock settings are returned by name so no live reference is kept.
+    """
+    *parents, name = path.split(".")
+    owner = scene
+    for parent in parents:
+        owner = getattr(owner, parent)
+    value = getattr(owner, name)
+    return value.name if isinstance(value, bpy.types.ID) else value
+
+
+def _set_setting(scene: bpy.types.Scene, path: str, value) -> None:
+    """Set a dotted scene setting such as ``render.resolution_x``."""
+    *parents, name = path.split(".")
+    owner = scene
+    for parent in parents:
+        owner = getattr(owner, parent)
+    setattr(owner, name, value)
+
+
+class SceneSnapshot:
+    """Record a base scene once and cheaply restore it between jobs.
+
+    The snapshot stores the session UIDs of every datablock in
+    SNAPSHOT_COLLECTIONS, the SNAPSHOT_SETTINGS of the scene and the
+    transforms of the base objects. ``restore`` deletes only the datablocks
+    added since, reverts only the settings and transforms that changed, and
+    then checks the result. If anything drifted (a base datablock was deleted
+    or renamed, or a setting would not revert) it falls back to ``reload``,
+    the full reset that built the base scene, and takes a fresh snapshot.
+
+    Edits made inside base datablocks (mesh data, materials, animation) are
+    not tracked; jobs should only add to the base scene.
+    """
+
+    def __init__(self, reload: Callable[[], None]) -> None:
+        self.reload = reload
+        self.capture()
+
+    def capture(self) -> None:
+        """Record the current scene as the base state."""
+        scene = bpy.context.scene
+        self.scene_name = scene.name
+        self.datablocks = {
+            name: {(block.session_uid, block.name) for block in getattr(bpy.data, name)}
+            for name in SNAPSHOT_COLLECTIONS
+        }
+        self.settings = {path: _get_setting(scene, path) for path in SNAPSHOT_SETTINGS}
+        self.transforms = {
+            obj.name: obj.matrix_basis.copy() for obj in bpy.data.objects
+        }
+
+    def restore(self) -> bool:
+        """Restore the base scene; return False if a full reload was needed."""
+        ensure_object_mode()
+
+        added = []
+        for name in SNAPSHOT_COLLECTIONS:
+            base_uids = {uid for uid, _ in self.datablocks[name]}
+            added.extend(
+                block for block in getattr(bpy.data, name) if block.session_uid not in base_uids
+            )
+        if added:
+            bpy.data.batch_remove(added)
+
+        scene = bpy.data.scenes.get(self.scene_name)
+        if scene is not None:
+            window = bpy.context.window
+            if window is not None and window.scene != scene:
+                window.scene = scene
+            for path, value in self.settings.items():
+                if _get_setting(scene, path) == value:
+                    continue
+                if path in SNAPSHOT_ID_SETTINGS and value is not None:
+                    value = getattr(bpy.data, SNAPSHOT_ID_SETTINGS[path]).get(value)
+                    if value is None:
+                        continue  # Base datablock was deleted; matches() reports the drift
+                _set_setting(scene, path, value)
+            for obj_name, matrix in self.transforms.items():
+                obj = bpy.data.objects.get(obj_name)
+                if obj is not None and obj.matrix_basis != matrix:
+                    obj.matrix_basis = matrix
+            scene.frame_set(self.settings["frame_current"])
+
+        if self.matches():
+            return True
+
+        typer.secho("⚠ Scene drifted from snapshot, doing a full reload", fg=typer.colors.YELLOW)
+        self.reload()
+        self.capture()
+        return False
+
+    def matches(self) -> bool:
+        """Check that the current scene is identical to the snapshot."""
+        scene = bpy.data.scenes.get(self.scene_name)
+        if scene is None or bpy.context.scene != scene:
+            return False
+        for name in SNAPSHOT_COLLECTIONS:
+            current = {(block.session_uid, block.name) for block in getattr(bpy.data, name)}
+            if current != self.datablocks[name]:
+                return False
+        return all(
+            _get_setting(scene, path) == value for path, value in self.settings.items()
+        )
+
+
+def validate_asset(fbx_path: Path, bone_name: str) -> dict:
+    """Import an FBX file and check it is usable for camera tracking.
+
+    The asset is ok when it has an armature with the target bone, a
+    non-empty animation range and a height inside RIG_HEIGHT_RANGE.
+    """
+    result = {
+        "path": str(fbx_path.resolve()),
+        "size": None,
+        "mtime": None,
+        "armature": None,
+        "bone": bone_name,
+        "has_bone": False,
+        "frame_start": None,
+        "frame_end": None,
+        "height": None,
+        "ok": False,
+        "error": None,
+    }
+    try:
+        stat = fbx_path.stat()
+        result["size"] = stat.st_size
+        result["mtime"] = stat.st_mtime
+        imported_objects = import_fbx(fbx_path)
+    except (OSError, RuntimeError, typer.Exit) as e:
+        result["error"] = str(e) or "Import failed"
+        return result
+
+    armature = find_armature(imported_objects)
+    if armature is None:
+        result["error"] = "No armature found"
+        return result
+    result["armature"] = armature.name
+    result["has_bone"] = bone_name in armature.pose.bones
+
+    frame_range = get_animation_frame_range(armature)
+    if frame_range:
+        result["frame_start"], result["frame_end"] = frame_range
+
+    # World Z range of the bounds: Mixamo rigs carry a 90° X rotation, so
+    # the armature's local Z is its depth, not its height
+    bpy.context.view_layer.update()
+    corners_z = [(armature.matrix_world @ Vector(corner)).z for corner in armature.bound_box]
+    result["height"] = max(corners_z) - min(corners_z)
+
+    min_height, max_height = RIG_HEIGHT_RANGE
+    if not result["has_bone"]:
+        result["error"] = f"Target bone not found: {bone_name}"
+    elif not frame_range or frame_range[1] <= frame_range[0]:
+        result["error"] = "No usable animation range"
+    elif not min_height <= result["height"] <= max_height:
+        result["error"] = f"Rig height {result['height']:.2f} m outside {RIG_HEIGHT_RANGE}"
+    else:
+        result["ok"] = True
+    return result
+
+
+def count_keyframes(obj: bpy.types.Object) -> int:
+    """Count the keyed frames on an object's active action.
+
+    A frame keyed on several channels counts once, matching the number the
+    bake reports as "Baked N keyframes".
+    """
+    if not obj.animation_data or not obj.animation_data.action:
+        return 0
+    frames = set()
+    for fcurve in obj.animation_data.action.fcurves:
+        frames.update(point.co[0] for point in fcurve.keyframe_points)
+    return len(frames)
+
+
+class BlenderJobMetrics(JobMetrics):
+    """JobMetrics that also counts the objects and datablocks in the session."""
+
+    def counts(self) -> dict:
+        return {
+            "objects": len(bpy.data.objects),
+            "datablocks": sum(len(getattr(bpy.data, name)) for name in DATABLOCK_COLLECTIONS),
+        }
+
+
 @app.command()
+@track_job("test-import", "fbx_file", BlenderJobMetrics)
 def test_import(
     fbx_file: Annotated[Path, typer.Argument(help="Path to the FBX file to test")],
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
 ) -> None:
     """Test importing an FBX file and report what's found.
     
@@ -233,11 +720,13 @@ def test_import(
     
     # Reset scene
     typer.echo("Resetting scene...")
-    reset_scene()
-    ensure_object_mode()
+    with job_stage("reset"):
+        reset_scene()
+        ensure_object_mode()
     
     # Import FBX
-    imported_objects = import_fbx(fbx_file)
+    with job_stage("import"):
+        imported_objects = import_fbx(fbx_file)
     
     # Report findings
     typer.echo(f"\n📦 Imported {len(imported_objects)} objects:")
@@ -250,11 +739,12 @@ def test_import(
         typer.secho(f"\n✓ Found armature: {armature.name}", fg=typer.colors.GREEN)
         
         # Check for animation
-        if armature.animation_data and armature.animation_data.action:
-            action = armature.animation_data.action
-            start, end = action.frame_range
-            typer.echo(f"  Animation: frames {int(start)} - {int(end)}")
-            typer.echo(f"  Duration: {int(end - start)} frames")
+        frame_range = get_animation_frame_range(armature)
+        if frame_range:
+            start, end = frame_range
+            current_job().frames = end - start + 1
+            typer.echo(f"  Animation: frames {start} - {end}")
+            typer.echo(f"  Duration: {end - start} frames")
         else:
             typer.secho("  ⚠ No animation data found", fg=typer.colors.YELLOW)
         
@@ -276,6 +766,7 @@ def test_import(
 
 
 @app.command()
+@track_job("test-template", "fbx_file", BlenderJobMetrics)
 def test_template(
     blend_file: Annotated[Path, typer.Argument(help="Path to the blend file template")],
     fbx_file: Annotated[Path, typer.Argument(help="Path to the FBX file to import")],
@@ -283,6 +774,8 @@ def test_template(
         Optional[Path],
         typer.Option("--output", "-o", help="Output .blend file path"),
     ] = None,
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
 ) -> None:
     """Test loading a blend file template and importing an FBX into it.
     
@@ -295,7 +788,8 @@ def test_template(
     
     # Step 1: Load blend file
     typer.echo("\n1. Loading blend template...")
-    load_blend_file(blend_file)
+    with job_stage("load"):
+        load_blend_file(blend_file)
     
     # Report what's in the scene
     typer.echo(f"\n📦 Template contains {len(bpy.data.objects)} objects:")
@@ -306,7 +800,8 @@ def test_template(
     
     # Step 2: Import FBX
     typer.echo(f"\n2. Importing FBX: {fbx_file}")
-    imported_objects = import_fbx(fbx_file)
+    with job_stage("import"):
+        imported_objects = import_fbx(fbx_file)
     typer.secho(f"✓ Imported {len(imported_objects)} new objects", fg=typer.colors.GREEN)
     
     # Step 3: Verify the scene
@@ -317,15 +812,17 @@ def test_template(
     armature = find_armature(imported_objects)
     if armature:
         typer.secho(f"✓ Found imported armature: {armature.name}", fg=typer.colors.GREEN)
-        if armature.animation_data and armature.animation_data.action:
-            action = armature.animation_data.action
-            start, end = action.frame_range
-            typer.echo(f"  Animation: frames {int(start)} - {int(end)}")
+        frame_range = get_animation_frame_range(armature)
+        if frame_range:
+            start, end = frame_range
+            current_job().frames = end - start + 1
+            typer.echo(f"  Animation: frames {start} - {end}")
     
     # Step 4: Save if requested
     if output:
         typer.echo(f"\n4. Saving result...")
-        save_blend_file(output)
+        with job_stage("save"):
+            save_blend_file(output)
     else:
         typer.echo("\n4. Not saving (use --output to save)")
     
@@ -334,6 +831,7 @@ def test_template(
 
 
 @app.command()
+@track_job("create", "fbx_file", BlenderJobMetrics)
 def create(
     fbx_file: Annotated[Path, typer.Argument(help="Path to the FBX file to import")],
     output: Annotated[
@@ -345,32 +843,55 @@ def create(
         typer.Option("--bone", "-b", help="Target bone name for camera tracking"),
     ] = TARGET_BONE_NAME,
     start_frame: Annotated[
-        int, typer.Option("--start", "-s", help="Animation start frame")
-    ] = 1,
+        Optional[int], typer.Option("--start", "-s", help="Animation start frame (defaults to first frame of armature animation)")
+    ] = None,
     end_frame: Annotated[
         Optional[int], typer.Option("--end", "-e", help="Animation end frame (defaults to last frame of armature animation)")
     ] = None,
     no_lights: Annotated[
         bool, typer.Option("--no-lights", help="Skip adding studio lights")
     ] = False,
+    stream: Annotated[
+        bool,
+        typer.Option("--stream", help="Bake in fixed-size frame chunks (long takes)"),
+    ] = False,
+    chunk_size: Annotated[
+        int, typer.Option("--chunk-size", help="Frames per chunk when streaming")
+    ] = BAKE_CHUNK_SIZE,
+    smoothing: Annotated[
+        int,
+        typer.Option("--smoothing", help="Odd moving-average window in keys when streaming"),
+    ] = 1,
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
 ) -> None:
     """Import an FBX file and create a TikTok-style camera that follows the animation.
 
     Example:
         blender --background --python week2_ex4_fbx_tiktok.py -- create character.fbx
         blender --background --python week2_ex4_fbx_tiktok.py -- create character.fbx --output my_scene.blend
+        blender --background --python week2_ex4_fbx_tiktok.py -- create take.fbx --stream --chunk-size 2000
     """
+    if smoothing > 1 and not stream:
+        typer.secho("Error: --smoothing requires --stream", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+    if smoothing < 1 or smoothing % 2 == 0:
+        typer.secho("Error: --smoothing must be an odd number of keys", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
     typer.secho("🎬 TikTok Camera Setup", fg=typer.colors.CYAN, bold=True)
     typer.echo("=" * 50)
 
     # Step 1: Reset scene
     typer.echo("1. Resetting scene...")
-    reset_scene()
-    ensure_object_mode()
+    with job_stage("reset"):
+        reset_scene()
+        ensure_object_mode()
 
     # Step 2: Import FBX
     typer.echo(f"2. Importing FBX: {fbx_file}")
-    imported_objects = import_fbx(fbx_file)
+    with job_stage("import"):
+        imported_objects = import_fbx(fbx_file)
 
     # Step 3: Find armature
     typer.echo("3. Looking for armature...")
@@ -391,10 +912,23 @@ def create(
         target = armature
         target_bone = bone
 
+    frame_range = get_animation_frame_range(armature) if armature else None
+
+    # Determine start frame if not specified (NLA and mocap takes may start at 0 or earlier)
+    if start_frame is None:
+        if frame_range:
+            start_frame = frame_range[0]
+            typer.secho(
+                f"✓ Using armature animation start frame: {start_frame}",
+                fg=typer.colors.GREEN,
+            )
+        else:
+            start_frame = 1  # Fallback default
+
     # Determine end frame if not specified
     if end_frame is None:
-        if armature and armature.animation_data and armature.animation_data.action:
-            end_frame = int(armature.animation_data.action.frame_range[1])
+        if frame_range:
+            end_frame = frame_range[1]
             typer.secho(
                 f"✓ Using armature animation end frame: {end_frame}",
                 fg=typer.colors.GREEN,
@@ -412,22 +946,36 @@ def create(
 
     # Step 5: Create camera
     typer.echo("4. Creating TikTok-style camera...")
-    camera = create_tiktok_camera()
+    with job_stage("camera"):
+        camera = create_tiktok_camera()
 
     # Step 6: Setup tracking
     typer.echo("5. Setting up camera tracking...")
-    setup_camera_tracking(camera, target, target_bone, start_frame, end_frame)
+    with job_stage("bake"):
+        setup_camera_tracking(
+            camera,
+            target,
+            target_bone,
+            start_frame,
+            end_frame,
+            chunk_size=chunk_size if stream else None,
+            smoothing=smoothing,
+        )
+    current_job().frames = end_frame - start_frame + 1
+    current_job().keyframes = count_keyframes(camera)
 
     # Step 7: Add lighting
     if not no_lights:
         typer.echo("6. Adding studio lighting...")
-        add_studio_lighting()
+        with job_stage("lights"):
+            add_studio_lighting()
     else:
         typer.echo("6. Skipping lights (--no-lights specified)")
 
     # Step 8: Save file
     typer.echo("7. Saving blend file...")
-    save_blend_file(output)
+    with job_stage("save"):
+        save_blend_file(output)
 
     typer.echo("=" * 50)
     typer.secho("✨ Setup complete!", fg=typer.colors.GREEN, bold=True)
@@ -438,5 +986,199 @@ def create(
     typer.echo(f"Frame range: {start_frame} - {end_frame}")
 
 
+@app.command()
+@track_job("render", "blend_file", BlenderJobMetrics)
+def render(
+    blend_file: Annotated[Path, typer.Argument(help="Blend file with a tracked camera (from create)")],
+    output_dir: Annotated[
+        Path, typer.Option("--output-dir", "-o", help="Directory for the image sequences")
+    ] = Path("renders"),
+    aspects: Annotated[
+        Optional[list[str]],
+        typer.Option("--aspect", "-a", help=f"Aspect ratio to render, repeatable ({', '.join(ASPECT_RATIOS)})"),
+    ] = None,
+    camera_name: Annotated[
+        str, typer.Option("--camera", "-c", help="Tracked camera object name")
+    ] = "TikTokCamera",
+    start_frame: Annotated[
+        Optional[int], typer.Option("--start", "-s", help="First frame (defaults to scene start)")
+    ] = None,
+    end_frame: Annotated[
+        Optional[int], typer.Option("--end", "-e", help="Last frame (defaults to scene end)")
+    ] = None,
+    engine: Annotated[
+        RenderEngine,
+        typer.Option("--engine", help="Render engine for the session (persistent data needs CYCLES)"),
+    ] = RenderEngine.CYCLES.value,
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
+) -> None:
+    """Render several aspect ratios of the tracked camera in a single session.
+
+    Example:
+        python project2_ex1_fbx_tiktok_renderer.py render week2ex4_tiktok.blend -a 9:16 -a 1:1 -a 16:9
+        python project2_ex1_fbx_tiktok_renderer.py render week2ex4_tiktok.blend -a 9:16 --engine BLENDER_EEVEE
+    """
+    aspects = aspects or [DEFAULT_ASPECT]
+    unknown = [aspect for aspect in aspects if aspect not in ASPECT_RATIOS]
+    if unknown:
+        typer.secho(f"Error: Unknown aspect ratio(s): {', '.join(unknown)}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    typer.secho("🎥 Multi-Format Render", fg=typer.colors.CYAN, bold=True)
+    typer.echo("=" * 50)
+
+    typer.echo("1. Loading blend file...")
+    with job_stage("load"):
+        load_blend_file(blend_file)
+
+    camera = bpy.data.objects.get(camera_name)
+    if camera is None or camera.type != "CAMERA":
+        typer.secho(f"Error: Camera not found: {camera_name}", fg=typer.colors.RED)
+        raise typer.Exit(code=1)
+
+    scene = bpy.context.scene
+    start_frame = scene.frame_start if start_frame is None else start_frame
+    end_frame = scene.frame_end if end_frame is None else end_frame
+
+    typer.echo(
+        f"2. Rendering {', '.join(aspects)} with {engine.value} for frames {start_frame} - {end_frame}..."
+    )
+    with job_stage("render"):
+        render_aspect_ratios(camera, aspects, output_dir, start_frame, end_frame, engine.value)
+    current_job().frames = (end_frame - start_frame + 1) * len(aspects)
+
+    typer.echo("=" * 50)
+    typer.secho(f"✨ Renders saved to {output_dir}", fg=typer.colors.GREEN, bold=True)
+
+
+@app.command()
+@track_job("validate-shard", "list_file", BlenderJobMetrics)
+def validate_shard(
+    list_file: Annotated[Path, typer.Argument(help="Text file with one FBX path per line")],
+    output: Annotated[
+        Path, typer.Option("--output", "-o", help="JSON-lines file receiving one result per FBX")
+    ],
+    bone: Annotated[
+        str,
+        typer.Option("--bone", "-b", help="Target bone name required by camera tracking"),
+    ] = TARGET_BONE_NAME,
+    worker: Annotated[
+        Optional[int],
+        typer.Option("--worker", help="Worker number, added as a label to the job record"),
+    ] = None,
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
+) -> None:
+    """Validate a shard of FBX files in one Blender session (used by `validate`).
+
+    Results are appended as each file finishes, so a crashed worker keeps
+    what it already checked. A ``{"started": path}`` line is written before
+    each import so `validate` can tell which file a crashed worker was on.
+    The scene is restored from a snapshot between files instead of being
+    reset.
+
+    Example:
+        python project2_ex1_fbx_tiktok_renderer.py validate-shard shard_0.txt -o shard_0.jsonl
+    """
+    if worker is not None:
+        current_job().labels["worker"] = str(worker)
+    fbx_paths = [Path(line) for line in list_file.read_text().splitlines() if line.strip()]
+    typer.secho(f"🔍 Validating {len(fbx_paths)} FBX files", fg=typer.colors.CYAN, bold=True)
+
+    def reload() -> None:
+        reset_scene()
+        ensure_object_mode()
+
+    with job_stage("reset"):
+        reload()
+        snapshot = SceneSnapshot(reload)
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with output.open("a") as f:
+        for index, fbx_path in enumerate(fbx_paths, start=1):
+            f.write(json.dumps({"started": str(fbx_path.resolve())}) + "\n")
+            f.flush()
+            with job_stage("import"):
+                result = validate_asset(fbx_path, bone)
+            with job_stage("restore"):
+                snapshot.restore()
+            f.write(json.dumps(result) + "\n")
+            f.flush()
+
+            status = "✓" if result["ok"] else f"✗ {result['error']}"
+            typer.echo(f"  [{index}/{len(fbx_paths)}] {fbx_path.name}: {status}")
+
+    typer.secho("✓ Shard complete", fg=typer.colors.GREEN)
+
+
+@app.command()
+@track_job("bench-reset", "fbx_file", BlenderJobMetrics)
+def bench_reset(
+    fbx_file: Annotated[Path, typer.Argument(help="FBX file imported by every simulated job")],
+    template: Annotated[
+        Optional[Path],
+        typer.Option("--template", "-t", help="Blend template used as the base scene"),
+    ] = None,
+    iterations: Annotated[
+        int, typer.Option("--iterations", "-n", min=1, help="Jobs to simulate per reset path")
+    ] = 5,
+    metrics: MetricsOption = None,
+    metrics_format: MetricsFormatOption = MetricsFormat.JSONL.value,
+) -> None:
+    """Compare the full scene reset with snapshot restore between jobs.
+
+    Example:
+        python project2_ex1_fbx_tiktok_renderer.py bench-reset character.fbx -n 10
+        python project2_ex1_fbx_tiktok_renderer.py bench-reset character.fbx --template scene.blend
+    """
+    typer.secho("⏱ Reset Benchmark", fg=typer.colors.CYAN, bold=True)
+    typer.echo("=" * 50)
+
+    def reload() -> None:
+        if template:
+            load_blend_file(template)
+        else:
+            reset_scene()
+        ensure_object_mode()
+
+    reload()
+    snapshot = SceneSnapshot(reload)
+    full_times = []
+    snapshot_times = []
+    fallbacks = 0
+
+    for iteration in range(iterations):
+        typer.echo(f"\nJob {iteration + 1}/{iterations}")
+        import_fbx(fbx_file)
+        with job_stage("full_reset"):
+            start = time.perf_counter()
+            reload()
+            full_times.append(time.perf_counter() - start)
+        snapshot.capture()  # The reload replaced every datablock
+
+        import_fbx(fbx_file)
+        with job_stage("snapshot_restore"):
+            start = time.perf_counter()
+            if not snapshot.restore():
+                fallbacks += 1
+            snapshot_times.append(time.perf_counter() - start)
+
+    full_ms = 1000 * sum(full_times) / iterations
+    snapshot_ms = 1000 * sum(snapshot_times) / iterations
+    typer.echo("=" * 50)
+    typer.echo(f"Full reset:       {full_ms:8.1f} ms/job")
+    typer.echo(f"Snapshot restore: {snapshot_ms:8.1f} ms/job")
+    if fallbacks:
+        typer.secho(f"⚠ {fallbacks} restore(s) fell back to a full reload", fg=typer.colors.YELLOW)
+    speedup = full_ms / snapshot_ms if snapshot_ms else math.inf
+    typer.secho(
+        f"✨ Snapshot restore is {speedup:.1f}x faster",
+        fg=typer.colors.GREEN,
+        bold=True,
+    )
+
+
 if __name__ == "__main__":
-    app()
+    # Under `blender --python script.py -- args`, only the args after "--" are ours
+    app(args=sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else None)